@@ -1,9 +1,6 @@
-from dotenv import load_dotenv
-import os
-from perplexity import Perplexity
+from config import Config
 
-load_dotenv("environment_test.env")  # Load environment variables from .env file
-client = Perplexity(api_key=os.getenv("PERPLEXITY_API_KEY")) # Uses PERPLEXITY_API_KEY from .env file
+client = Config.get_llm_client() # Uses PERPLEXITY_API_KEY from environment_test.env
 
 completion = client.chat.completions.create(
     model="sonar-pro",
@@ -1,13 +1,29 @@
 # run by dedicate terminal
 
-from perplexity import Perplexity
+from perplexity import Perplexity, AsyncPerplexity, DefaultAsyncHttpxClient
+from neo4j import GraphDatabase
+import httpx
 import os
+import json
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import List,Dict
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
 # Load environment variables from .env file
-load_dotenv("environment_test.env")
+ENV_FILE = Path(__file__).parent / "environment_test.env"
+
+def _load_env():
+    """Read ENV_FILE once per process tree; child processes inherit os.environ."""
+    if not os.environ.get("_ENV_LOADED"):
+        load_dotenv(ENV_FILE)
+        os.environ["_ENV_LOADED"] = "1"
+
+_load_env()
 
 
 # client = Perplexity(api_key=os.getenv("PERPLEXITY_API_KEY")) # Uses PERPLEXITY_API_KEY from .env file
@@ -33,17 +49,35 @@ class Config:
     LLM_MODEL = "anthropic/claude-haiku-4-5"
     MAX_OUTPUT_TOKENS = 1500
     TEMPERATURE = 0.0
+    LLM_CONCURRENCY = 16  # max in-flight requests in llm_pipeline.extract_batch
+
+    # Semantic cache (semantic_cache.py): reuse triples of near-duplicate reports
+    USE_SEMANTIC_CACHE = False  # needs faiss-cpu + sentence-transformers
+    SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    SEMANTIC_CACHE_THRESHOLD = 0.92  # cosine similarity for a candidate; hits also need the same words, see semantic_cache.py
 
     # Neo4j database
     NEO4J_URI = os.getenv("NEO4J_URI")
     NEO4J_USER = os.getenv("NEO4J_USER")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
     ## create a .env file to save URI, USER and PASSWORD for Neo4j
+    NEO4J_BATCH_SIZE = 1000  # rows per UNWIND transaction in GraphManager.upload_triples
+    NEO4J_DELETE_BATCH_SIZE = 10_000  # rows per inner transaction in GraphManager.clear_pipeline_data
+    NEO4J_UPLOAD_CONCURRENCY = 1  # >1: upload_pipeline_results writes that many slabs in parallel (opt-in)
+    NEO4J_POOL_SIZE = 32  # max pooled Bolt connections per driver (driver default: 100)
+    NEO4J_ACQUISITION_TIMEOUT = 60  # seconds to wait for a free pooled connection
+    NEO4J_MAX_CONNECTION_LIFETIME = 3600  # seconds before a pooled connection is recycled
 
     # CSV format
     CSV_TEXT_COLUMN = 0
     CSV_HAS_HEADER = True
     CSV_ENCODING = "utf-8"
+    CSV_CHUNK_SIZE = 50_000  # rows read + cleaned at a time by data_loader
+
+    # spaCy (nlp_baseline.py); see the model notes there before switching
+    SPACY_MODEL = "en_core_web_lg"
+    SPACY_BATCH_SIZE = 64
+    SPACY_N_PROCESS = 1  # >1 starts worker processes; worth it for full-dataset runs
 
     # Experiment settings
     SAMPLE_SIZE = 100
@@ -128,8 +162,25 @@ Allowed relationship types: {relationship_types}
 Few-shot examples:
 {few_show_examples}
 
-Now extract from: "{text}"
 """
+    # Only this tail changes per report; keeping it last leaves the prefix
+    # above byte-identical across calls so provider prompt caching can hit.
+    EXTRACTION_PROMPT_TAIL = 'Now extract from: "{text}"\n'
+
+    # Rendered once at class definition, so build_extraction_prompt only formats the tail.
+    # (Changing FEW_SHOT_COUNT etc. at runtime does not re-render these.)
+    _ENTITIES_STR = ", ".join(ENTITY_TYPES)
+    _RELS_STR = ", ".join(RELATIONSHIP_TYPES)
+    _FEW_SHOTS = FEW_SHOT_EXAMPLES[:FEW_SHOT_COUNT]
+    _EXAMPLES_STR = "\n".join(
+        f"Text: {ex['text']}\nTriples: {ex['triples']}\n"
+        for ex in _FEW_SHOTS
+    )
+    _PROMPT_PREFIX = EXTRACTION_PROMPT.format(
+        entity_types = _ENTITIES_STR,
+        relationship_types = _RELS_STR,
+        few_show_examples = _EXAMPLES_STR
+    )
     
     # checked esitency of API, Few-shot examples, directories.
     @staticmethod
@@ -138,19 +189,39 @@ Now extract from: "{text}"
             raise ValueError("PERPLEXITY_API_KEY not found in .env file.")
         return Perplexity(api_key=Config.PERPLEXITY_API_KEY)
 
+    @staticmethod
+    def get_async_llm_client(concurrency: int = LLM_CONCURRENCY):
+        """Async client whose connection pool matches the request concurrency."""
+        if not Config.PERPLEXITY_API_KEY:
+            raise ValueError("PERPLEXITY_API_KEY not found in .env file.")
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        return AsyncPerplexity(
+            api_key=Config.PERPLEXITY_API_KEY,
+            http_client=DefaultAsyncHttpxClient(limits=limits)
+        )
+
+    @staticmethod
+    def _neo4j_driver_kwargs() -> Dict:
+        """Credentials and pool settings for the Neo4j driver."""
+        if not Config.NEO4J_URI or not Config.NEO4J_PASSWORD:
+            raise ValueError("Neo4j credentials missing in .env file.")
+        return {
+            "uri":                            Config.NEO4J_URI,
+            "auth":                           (Config.NEO4J_USER, Config.NEO4J_PASSWORD),
+            "max_connection_pool_size":       Config.NEO4J_POOL_SIZE,
+            "connection_acquisition_timeout": Config.NEO4J_ACQUISITION_TIMEOUT,
+            "max_connection_lifetime":        Config.NEO4J_MAX_CONNECTION_LIFETIME
+        }
+
+    @staticmethod
+    def get_neo4j_driver():
+        """Neo4j driver with an explicitly sized connection pool."""
+        return GraphDatabase.driver(**Config._neo4j_driver_kwargs())
+
     @staticmethod
     def build_extraction_prompt(text: str) -> str:
         """Builds complete LLM prompt with few-shot."""
-        examples_str = "\n".join([
-            f"Text: {ex['text']}\nTriples: {ex['triples']}\n"
-            for ex in Config.FEW_SHOT_EXAMPLES[:Config.FEW_SHOT_COUNT]
-        ])
-        return Config.EXTRACTION_PROMPT.format(
-            entity_types = ", ".join(Config.ENTITY_TYPES),
-            relationship_types = ", ".join(Config.RELATIONSHIP_TYPES),
-            few_show_examples = examples_str,
-            text = text
-        )
+        return Config._PROMPT_PREFIX + Config.EXTRACTION_PROMPT_TAIL.format(text=text)
     
     @staticmethod
     def ensure_dirs():
@@ -160,6 +231,15 @@ Now extract from: "{text}"
         Config.PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
         print("Directories ready!")
 
+    @staticmethod
+    def save_json(path: Path, data) -> None:
+        """Write `data` as indented UTF-8 JSON, using orjson when it is installed."""
+        if orjson is not None:
+            Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
 # Test
 if __name__ == "__main__":
     Config.ensure_dirs()
@@ -169,7 +249,7 @@ if __name__ == "__main__":
     print(f"Neo4j URI    : {Config.NEO4J_URI}")
     print(f"Entities     : {len(Config.ENTITY_TYPES)} types")
     print(f"Relations    : {len(Config.RELATIONSHIP_TYPES)} types")
-    print(f"Few-shot     : {len(Config.FEW_SHOT_EXAMPLES)} examples")
+    print(f"Few-shot     : {len(Config._FEW_SHOTS)}/{len(Config.FEW_SHOT_EXAMPLES)} examples in prompt")
 
     # Preview prompt
     sample_text = "The accident occurred in City A at 6:00 am on 2/3/2022."
@@ -1,6 +1,8 @@
 import re
-import json
+import hashlib
 import pandas as pd
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from config import Config
 
@@ -14,20 +16,99 @@ CITY_FILES = {
 
 
 # Cleaning
+# Three passes, in the order the original re.sub chain ran them, each
+# compiled once: drop "<s>Human:", cut everything from "</s>", then strip tags.
+# The cut must run before the tag pass, otherwise a bare "<" in the report
+# ("speed<50 km/h</s>...") lets <[^>]+> swallow text across "</s".
+# DOTALL is inline ("(?s)") so the plain pattern strings can also be handed to
+# pandas, which only uses the Arrow regex kernels for uncompiled patterns.
+# Arrow runs those patterns with RE2, whose \s is ASCII-only, so whitespace is
+# spelled out as every character str.isspace() (and Python's \s) accepts;
+# both engines then treat '\xa0', '\u3000' etc. the same way.
+# (The non-Latin-1 ones are literal characters: RE2 has no \uXXXX escape.)
+_WS_CHARS = (r"\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0"
+             "\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000")
+_WS       = f"[{_WS_CHARS}]"
+_NON_WS   = f"[^{_WS_CHARS}]"
+
+_HUMAN_RE = re.compile(rf"<s>{_WS}*Human:{_WS}*")  # Remove <s>Human:
+_CUT_RE   = re.compile(r"(?s)</s>.*")               # Remove </s> onward
+_TAG_RE   = re.compile(
+    r"<[^>]+>"                     # Remove any <tag>
+    r"|<\\+s>"                     # Remove <\\s> variants
+)
+_CLEAN_PASSES = (_HUMAN_RE, _CUT_RE, _TAG_RE)
+_WS_RE = re.compile(f"{_WS}+")
+
+
 def clean_report(raw_text: str) -> str:
     """Strip LLM chat formatting artifacts and normalize whitespace."""
-    text = re.sub(r"<s>\s*Human:\s*", "", raw_text)   # Remove <s>Human:
-    text = re.sub(r"</s>.*", "", text, flags=re.DOTALL) # Remove </s> onward
-    text = re.sub(r"<[^>]+>", "", text)                 # Remove any <tag>
-    text = re.sub(r"<\\+s>", "", text)                  # Remove <\\s> variants
-    return re.sub(r"\s+", " ", text).strip()
+    text = raw_text
+    for pattern in _CLEAN_PASSES:
+        text = pattern.sub("", text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def clean_reports(texts: pd.Series) -> pd.Series:
+    """Vectorized clean_report over a whole text column (same output per row)."""
+    texts = texts.astype("string[pyarrow]")
+    for pattern in _CLEAN_PASSES:
+        texts = texts.str.replace(pattern.pattern, "", regex=True)
+    return (
+        texts.str.replace(_WS_RE.pattern, " ", regex=True)
+             .str.strip(" ")  # whitespace runs are single spaces by now
+    )
+
+
+# CSV Reader (with Parquet cache)
+def _cache_signature(filepath: Path) -> str:
+    """Short hash of the file's name, mtime and size plus the cleaning passes."""
+    st = filepath.stat()
+    sig = hashlib.blake2b(digest_size=8)
+    for part in (filepath.name, st.st_mtime_ns, st.st_size, *(p.pattern for p in _CLEAN_PASSES), _WS_RE.pattern):
+        sig.update(str(part).encode())
+    return sig.hexdigest()
+
+
+def _load_cleaned(filepath: Path, use_cache: bool = True) -> pd.Series:
+    """
+    Read one CSV and return its cleaned text column, indexed by row id.
+    Rows that clean to "" are kept so sampling matches the raw file order.
+    The result is cached as Parquet in PROCESSED_DIR and reused next time;
+    the cache name carries _cache_signature, so edited CSVs miss the cache.
+    """
+    cache_path = Config.PROCESSED_DIR / f"{filepath.stem}_cleaned_{_cache_signature(filepath)}.parquet"
+    if use_cache and cache_path.exists():
+        return pd.read_parquet(cache_path, engine="pyarrow")["text"].astype("string[pyarrow]")
+
+    columns = pd.read_csv(filepath, encoding=Config.CSV_ENCODING, nrows=0).columns
+    if "text" not in columns:
+        raise KeyError(f"Column 'text' not found in {filepath.name}. Found: {list(columns)}")
+
+    # Clean chunk by chunk so only one chunk of raw text is in memory at a time
+    chunks = []
+    reader = pd.read_csv(filepath, encoding=Config.CSV_ENCODING, dtype="string[pyarrow]",
+                         usecols=["text"], chunksize=Config.CSV_CHUNK_SIZE)
+    for chunk in reader:
+        text = chunk["text"].dropna()
+        del chunk  # raw column is no longer needed; free it before cleaning
+        text = text[text.str.contains(_NON_WS)]  # drop blank rows, as str.strip() would
+        chunks.append(clean_reports(text))
+    df = (pd.concat(chunks) if chunks else pd.Series(dtype="string[pyarrow]")).to_frame("text")
+
+    if use_cache:
+        for stale in Config.PROCESSED_DIR.glob(f"{filepath.stem}_cleaned*.parquet"):
+            stale.unlink()
+        df.to_parquet(cache_path, engine="pyarrow", compression="zstd")
+    return df["text"]
 
 
 # Main Loader 
 def load_data(
     cities: Optional[List[str]] = None,
     sample_size: Optional[int] = Config.SAMPLE_SIZE,
-    save_processed: bool = True
+    save_processed: bool = True,
+    use_cache: bool = True
 ) -> List[dict]:
     """
     Load and clean reports from one or more city CSVs.
@@ -36,6 +117,7 @@ def load_data(
         cities       : Keys from CITY_FILES to load. None = load all.
         sample_size  : Max reports per file. None = load all rows.
         save_processed: Save cleaned output to data/processed/cleaned_reports.json
+        use_cache    : Reuse/write the cleaned Parquet cache in data/processed/
 
     Returns:
         List of dicts: [{"source": "WA", "id": 0, "text": "..."}, ...]
@@ -43,27 +125,23 @@ def load_data(
     Config.ensure_dirs()
     targets = {k: v for k, v in CITY_FILES.items() if k in (cities or CITY_FILES)}
 
-    all_records = []
-    for city_key, filepath in targets.items():
+    for filepath in targets.values():
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: {filepath}")
 
-        df = pd.read_csv(filepath, encoding=Config.CSV_ENCODING, dtype=str)
-
-        if "text" not in df.columns:
-            raise KeyError(f"Column 'text' not found in {filepath.name}. Found: {list(df.columns)}")
-
-        df = df[["text"]].dropna()
-        df["text"] = df["text"].str.strip()
-        df = df[df["text"] != ""]
+    # pandas releases the GIL while parsing, so the CSVs are read in parallel
+    with ThreadPoolExecutor(max_workers=max(len(targets), 1)) as pool:
+        frames = list(pool.map(lambda path: _load_cleaned(path, use_cache), targets.values()))
 
+    all_records = []
+    for (city_key, filepath), cleaned in zip(targets.items(), frames):
         if sample_size is not None:
-            df = df.head(sample_size)
+            cleaned = cleaned.head(sample_size)
 
+        cleaned = cleaned[cleaned != ""]  # Skip empty after cleaning
         records = [
-            {"source": city_key, "id": idx, "text": clean_report(row["text"])}
-            for idx, row in df.iterrows()
-            if clean_report(row["text"])  # Skip empty after cleaning
+            {"source": city_key, "id": int(idx), "text": text}
+            for idx, text in zip(cleaned.index.to_numpy(), cleaned.to_numpy())
         ]
         print(f"{city_key}: {len(records)} reports loaded from {filepath.name}")
         all_records.extend(records)
@@ -72,8 +150,7 @@ def load_data(
 
     if save_processed and all_records:
         out_path = Config.PROCESSED_DIR / "cleaned_reports.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(all_records, f, indent=2, ensure_ascii=False)
+        Config.save_json(out_path, all_records)
         print(f"Saved → {out_path}")
 
     return all_records
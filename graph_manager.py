@@ -2,10 +2,14 @@
 - Connects to Neo4j using credentials from Config
 - Accepts triples in {"head", "relation", "tail"} format
 - Uses MERGE to avoid duplicate nodes/relationships
+- Uploads in batches: one UNWIND query per (head label, relation, tail label)
 """
 
-from neo4j import GraphDatabase
-from typing import List, Dict
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Tuple, Iterable, Iterator
 from config import Config
 import logging
 
@@ -17,13 +21,26 @@ class GraphManager:
     """Manages Neo4j connection and Cypher operations."""
 
     def __init__(self):
-        if not Config.NEO4J_URI or not Config.NEO4J_PASSWORD:
-            raise ValueError("Neo4j credentials missing in .env file.")
-        self.driver = GraphDatabase.driver(
-            Config.NEO4J_URI,
-            auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD)
-        )
-        logger.info("Neo4j connection established.")
+        self.driver = Config.get_neo4j_driver()
+        self._cypher_cache: Dict[Tuple[str, str, str], str] = {}
+        self._schema_ready = False
+
+        # Verified once here; the connection it opens stays in the pool for the
+        # first upload session, and verify_connection just reports the result
+        try:
+            self.driver.verify_connectivity()
+            self._verified = True
+            logger.info("Neo4j connection established.")
+        except Exception as e:
+            self._verified = False
+            logger.error(f"Neo4j connection failed: {e}")
+
+        # Constraints exist before any caller can MERGE through this manager
+        if self._verified:
+            try:
+                self.ensure_schema()
+            except Exception as e:
+                logger.error(f"Could not create name constraints: {e}")
 
     def close(self):
         """Always call this when done to release the connection."""
@@ -31,14 +48,27 @@ class GraphManager:
         logger.info("Neo4j connection closed.")
 
     def verify_connection(self) -> bool:
-        """Ping Neo4j to confirm the connection is live."""
-        try:
-            self.driver.verify_connectivity()
-            logger.info("Neo4j connectivity verified.")
-            return True
-        except Exception as e:
-            logger.error(f"Neo4j connection failed: {e}")
-            return False
+        """Whether Neo4j was reachable when this GraphManager was created."""
+        return self._verified
+
+    def ensure_schema(self):
+        """
+        Create a uniqueness constraint on `name` for every label we MERGE on.
+        The backing index turns each MERGE lookup into an index seek instead
+        of a label scan. Called from __init__; IF NOT EXISTS makes re-runs
+        cheap no-ops.
+        """
+        labels = (set(self.RELATION_TAIL_LABEL.values())
+                  | set(self.RELATION_HEAD_LABEL.values())
+                  | {"AccidentCase", "Person", "Vehicle", "Entity"})
+        with self.driver.session() as session:
+            for label in sorted(labels):
+                session.run(
+                    f"CREATE CONSTRAINT {label.lower()}_name IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.name IS UNIQUE"
+                ).consume()
+        self._schema_ready = True
+        logger.info(f"Schema ready: unique name constraints on {len(labels)} labels.")
 
     # ──────────────────────────────────────────────────────────────────────────
     # SECTION 1: Node & Relationship Operations
@@ -50,7 +80,7 @@ class GraphManager:
         Label is inferred from the ontology if possible (see _infer_label).
         """
         cypher = f"MERGE (n:{label} {{name: $name}})"
-        tx.run(cypher, name=name)
+        tx.run(cypher, name=name).consume()
 
     def _merge_relationship(self, tx, head: str, head_label: str,
                              relation: str, tail: str, tail_label: str):
@@ -60,7 +90,7 @@ class GraphManager:
         MERGE (t:{tail_label} {{name: $tail}})
         MERGE (h)-[r:{relation}]->(t)
         """
-        tx.run(cypher, head=head, tail=tail)
+        tx.run(cypher, head=head, tail=tail).consume()
 
     # ──────────────────────────────────────────────────────────────────────────
     # SECTION 2: Label Inference
@@ -92,90 +122,218 @@ class GraphManager:
         "RESPONSIBILITY": "Department",
     }
 
-    def _infer_label(self, node_name: str, relation: str, is_head: bool) -> str:
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _name_label(node_name: str) -> str | None:
         """
-        Infer the Neo4j node label from the relation type and node name.
+        Label implied by the node name alone, or None.
         - AccidentCase nodes are detected by the 'WA_' / source prefix pattern.
         - Person nodes are detected by 'Person' prefix.
         - Vehicle nodes are detected by 'Vehicle' prefix.
-        - Falls back to ontology relation mapping, then 'Entity'.
         """
         # Detect AccidentCase by source prefix pattern (e.g., "WA_0")
-        if "_" in node_name and node_name.split("_")[0].isupper():
+        prefix, sep, _ = node_name.partition("_")
+        if sep and prefix.isupper():
             return "AccidentCase"
 
         # Detect Person/Vehicle by name prefix
-        if node_name.startswith("Person"):
-            return "Person"
-        if node_name.startswith("Vehicle"):
-            return "Vehicle"
+        if node_name.startswith(("Person", "Vehicle")):
+            return "Person" if node_name[0] == "P" else "Vehicle"
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _infer_label(node_name: str, relation: str, is_head: bool) -> str:
+        """
+        Infer the Neo4j node label from the relation type and node name.
+        The name-based label (_name_label) wins; otherwise falls back to the
+        ontology relation mapping, then 'AccidentCase' (head) / 'Entity' (tail).
+        Results are cached: the same case_id heads hundreds of triples.
+        """
+        name_label = GraphManager._name_label(node_name)
+        if name_label:
+            return name_label
 
         # Use relation-based lookup
         if is_head:
-            return self.RELATION_HEAD_LABEL.get(relation, "AccidentCase")
+            return GraphManager.RELATION_HEAD_LABEL.get(relation, "AccidentCase")
         else:
-            return self.RELATION_TAIL_LABEL.get(relation, "Entity")
+            return GraphManager.RELATION_TAIL_LABEL.get(relation, "Entity")
 
     # ──────────────────────────────────────────────────────────────────────────
     # SECTION 3: Batch Upload
     # ──────────────────────────────────────────────────────────────────────────
 
-    def upload_triples(self, triples: List[Dict], pipeline_tag: str = "nlp") -> int:
+    # Labels and relation types cannot be Cypher parameters, so one query string
+    # is rendered per (head_label, relation, tail_label) and reused verbatim.
+    # Identical query text lets Neo4j reuse the cached plan instead of re-planning.
+    UPSERT_TEMPLATE = """
+    UNWIND $rows AS row
+    MERGE (h:{head_label} {{name: row.head}})
+    MERGE (t:{tail_label} {{name: row.tail}})
+    MERGE (h)-[r:{relation}]->(t)
+    SET r.pipeline = $pipeline_tag
+    """
+
+    # Only ontology relation types are interpolated into Cypher
+    ALLOWED_RELATIONS = frozenset(Config.RELATIONSHIP_TYPES)
+
+    def _upsert_cypher(self, head_label: str, relation: str, tail_label: str) -> str:
+        """Rendered UPSERT_TEMPLATE for one label/relation combination (cached)."""
+        key = (head_label, relation, tail_label)
+        if key not in self._cypher_cache:
+            self._cypher_cache[key] = self.UPSERT_TEMPLATE.format(
+                head_label=head_label, relation=relation, tail_label=tail_label
+            )
+        return self._cypher_cache[key]
+
+    def upload_triples(self, triples: Iterable[Dict], pipeline_tag: str = "nlp",
+                       batch_size: int = Config.NEO4J_BATCH_SIZE) -> int:
         """
-        Upload a list of {"head", "relation", "tail"} triples to Neo4j.
+        Upload {"head", "relation", "tail"} triples to Neo4j.
         Adds a 'pipeline' property to each relationship for traceability.
 
+        `triples` is consumed `batch_size` at a time, so it can be a generator
+        and only one slab of rows is held in memory. Each slab is grouped by
+        (head_label, relation, tail_label), one UNWIND query per group, and
+        committed as one managed transaction (execute_write retries transient
+        errors). If a slab fails, its rows are retried one by one so a single
+        bad row does not drop the whole slab.
+
         Args:
-            triples      : List of triple dicts from nlp_baseline or llm_pipeline
+            triples      : Iterable of triple dicts from nlp_baseline or llm_pipeline
             pipeline_tag : "nlp" or "llm" — stored on each relationship
+            batch_size   : Max rows per transaction
 
         Returns:
             Number of triples successfully uploaded.
         """
-        success_count = 0
+        success_count, attempted = 0, 0
         with self.driver.session() as session:
-            for triple in triples:
-                head     = triple.get("head", "").strip()
-                relation = triple.get("relation", "").strip().upper()
-                tail     = triple.get("tail", "").strip()
-
-                # Skip malformed triples
-                if not head or not relation or not tail:
-                    logger.warning(f"Skipping malformed triple: {triple}")
-                    continue
-
-                head_label = self._infer_label(head, relation, is_head=True)
-                tail_label = self._infer_label(tail, relation, is_head=False)
-
-                try:
-                    session.execute_write(
-                        self._merge_relationship_with_tag,
-                        head, head_label, relation, tail, tail_label, pipeline_tag
-                    )
-                    success_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to upload triple {triple}: {e}")
-
-        logger.info(f"Uploaded {success_count}/{len(triples)} triples [{pipeline_tag}].")
+            for n_triples, slab in self._slabs(triples, batch_size):
+                attempted += n_triples
+                success_count += self._write_slab(session, slab, pipeline_tag)
+
+        logger.info(f"Uploaded {success_count}/{attempted} triples [{pipeline_tag}].")
         return success_count
 
-    @staticmethod
-    def _merge_relationship_with_tag(tx, head: str, head_label: str,
-                                      relation: str, tail: str,
-                                      tail_label: str, pipeline_tag: str):
-        """MERGE nodes + relationship, tag relationship with pipeline source."""
-        cypher = f"""
-        MERGE (h:{head_label} {{name: $head}})
-        MERGE (t:{tail_label} {{name: $tail}})
-        MERGE (h)-[r:{relation}]->(t)
-        SET r.pipeline = $pipeline_tag
+    def upload_triples_concurrent(self, triples: Iterable[Dict], pipeline_tag: str = "nlp",
+                                  batch_size: int = Config.NEO4J_BATCH_SIZE,
+                                  concurrency: int = Config.NEO4J_UPLOAD_CONCURRENCY) -> int:
+        """
+        Opt-in parallel version of upload_triples: the same slabs, but up to
+        `concurrency` are written at once, each in its own session on the
+        shared driver. Plain threads, so it also works inside a running
+        event loop (Jupyter, async apps).
+
+        Concurrent slabs MERGE the same hub nodes (case ids, "Person1",
+        "Fatal", ...), so they contend for locks; deadlocks are transient
+        errors that execute_write retries. Without the unique name
+        constraints concurrent MERGE can create duplicate nodes, so the
+        schema is ensured first and a failure to create it is raised.
+
+        Returns:
+            Number of triples successfully uploaded.
+        """
+        if not self._schema_ready:
+            self.ensure_schema()
+
+        def write(slab: List[Tuple[str, List[Dict]]]) -> int:
+            with self.driver.session() as session:
+                return self._write_slab(session, slab, pipeline_tag)
+
+        success_count, attempted = 0, 0
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # Only `concurrency` slabs are read from `triples` ahead of the writers
+            pending = set()
+            for n_triples, slab in self._slabs(triples, batch_size):
+                attempted += n_triples
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    success_count += sum(future.result() for future in done)
+                pending.add(pool.submit(write, slab))
+            success_count += sum(future.result() for future in wait(pending).done)
+
+        logger.info(f"Uploaded {success_count}/{attempted} triples [{pipeline_tag}].")
+        return success_count
+
+    def _write_slab(self, session, slab: List[Tuple[str, List[Dict]]], pipeline_tag: str) -> int:
+        """Commit one slab in a managed transaction; rows of a failed slab are retried one by one."""
+        try:
+            session.execute_write(self._merge_slab_with_tag, slab, pipeline_tag)
+            return sum(len(rows) for _, rows in slab)
+        except Exception as e:
+            logger.warning(f"Transaction of {sum(len(rows) for _, rows in slab)} triples failed, "
+                           f"retrying row by row: {e}")
+            return sum(self._retry_rows(session, cypher, rows, pipeline_tag) for cypher, rows in slab)
+
+    def _group_triples(self, triples: List[Dict]) -> Dict[Tuple[str, str, str], List[Dict]]:
+        """Validate triples and group their rows by (head_label, relation, tail_label)."""
+        groups: Dict[Tuple[str, str, str], List[Dict]] = defaultdict(list)
+        # Triples of one case arrive together with the same head (the case_id),
+        # so the name-based head label is worked out once per run of heads
+        prev_head, prev_head_label = None, None
+        for triple in triples:
+            head     = triple.get("head", "").strip()
+            relation = triple.get("relation", "").strip().upper()
+            tail     = triple.get("tail", "").strip()
+
+            # Skip malformed triples
+            if not head or not relation or not tail:
+                logger.warning(f"Skipping malformed triple: {triple}")
+                continue
+            if relation not in self.ALLOWED_RELATIONS:
+                logger.warning(f"Skipping triple with unknown relation: {triple}")
+                continue
+
+            if head != prev_head:
+                prev_head, prev_head_label = head, self._name_label(head)
+            head_label = prev_head_label or self.RELATION_HEAD_LABEL.get(relation, "AccidentCase")
+            tail_label = self._infer_label(tail, relation, is_head=False)
+            groups[(head_label, relation, tail_label)].append({"head": head, "tail": tail})
+        return groups
+
+    def _slabs(self, triples: Iterable[Dict],
+               batch_size: int) -> Iterator[Tuple[int, List[Tuple[str, List[Dict]]]]]:
+        """
+        Read `triples` in chunks of `batch_size` and yield (chunk size, slab).
+        A slab is the chunk's label groups as (cypher, rows) parts and is
+        written in one transaction, so small groups share a commit.
         """
-        tx.run(cypher, head=head, tail=tail, pipeline_tag=pipeline_tag)
+        it = iter(triples)
+        while chunk := list(islice(it, batch_size)):
+            groups = self._group_triples(chunk)
+            yield len(chunk), [(self._upsert_cypher(*key), rows) for key, rows in groups.items()]
+
+    def _retry_rows(self, session, cypher: str, rows: List[Dict], pipeline_tag: str) -> int:
+        """Fallback for a failed slab: upload each row on its own."""
+        success_count = 0
+        for row in rows:
+            try:
+                session.execute_write(self._merge_batch_with_tag, cypher, [row], pipeline_tag)
+                success_count += 1
+            except Exception as e:
+                logger.error(f"Failed to upload triple {row}: {e}")
+        return success_count
+
+    @staticmethod
+    def _merge_batch_with_tag(tx, cypher: str, rows: List[Dict], pipeline_tag: str):
+        """Run one UNWIND MERGE over `rows`, tagging relationships with the pipeline."""
+        tx.run(cypher, rows=rows, pipeline_tag=pipeline_tag).consume()
+
+    @staticmethod
+    def _merge_slab_with_tag(tx, slab: List[Tuple[str, List[Dict]]], pipeline_tag: str):
+        """Run every UNWIND MERGE of a slab inside the same transaction."""
+        for cypher, rows in slab:
+            tx.run(cypher, rows=rows, pipeline_tag=pipeline_tag).consume()
 
     def upload_pipeline_results(self, results: List[Dict], pipeline_tag: str = "nlp") -> Dict:
         """
         Upload all triples from a full pipeline result list.
         This is the main function called by main.py.
+        Triples of all cases are streamed into one upload_triples call, so
+        batches are grouped across cases. Set Config.NEO4J_UPLOAD_CONCURRENCY
+        above 1 to write slabs in parallel (upload_triples_concurrent).
 
         Args:
             results      : Output of run_nlp_pipeline() or run_llm_pipeline()
@@ -185,13 +343,12 @@ class GraphManager:
         Returns:
             Summary dict with total cases, triples attempted, triples uploaded.
         """
-        total_triples    = 0
-        uploaded_triples = 0
-
-        for result in results:
-            triples       = result.get("triples", [])
-            total_triples += len(triples)
-            uploaded_triples += self.upload_triples(triples, pipeline_tag=pipeline_tag)
+        all_triples      = (t for result in results for t in result.get("triples", []))
+        total_triples    = sum(len(result.get("triples", [])) for result in results)
+        if Config.NEO4J_UPLOAD_CONCURRENCY > 1:
+            uploaded_triples = self.upload_triples_concurrent(all_triples, pipeline_tag=pipeline_tag)
+        else:
+            uploaded_triples = self.upload_triples(all_triples, pipeline_tag=pipeline_tag)
 
         summary = {
             "pipeline":           pipeline_tag,
@@ -207,15 +364,21 @@ class GraphManager:
         Delete all relationships tagged with a specific pipeline.
         Useful for re-running experiments without duplicating data.
         Also removes orphan nodes (nodes with no relationships).
+        Deletes are committed every Config.NEO4J_DELETE_BATCH_SIZE rows, so
+        the server never holds one huge transaction. CALL ... IN TRANSACTIONS
+        needs an auto-commit transaction, hence session.run, not execute_write.
         """
+        batch = int(Config.NEO4J_DELETE_BATCH_SIZE)
         with self.driver.session() as session:
             session.run(
-                "MATCH ()-[r]->() WHERE r.pipeline = $tag DELETE r",
+                "MATCH ()-[r]->() WHERE r.pipeline = $tag "
+                f"CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {batch} ROWS",
                 tag=pipeline_tag
-            )
+            ).consume()
             session.run(
-                "MATCH (n) WHERE NOT (n)--() DELETE n"
-            )
+                "MATCH (n) WHERE NOT (n)--() "
+                f"CALL {{ WITH n DELETE n }} IN TRANSACTIONS OF {batch} ROWS"
+            ).consume()
         logger.info(f"Cleared all '{pipeline_tag}' data from Neo4j.")
 
     def get_graph_stats(self) -> Dict:
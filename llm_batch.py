@@ -0,0 +1,128 @@
+""" Batch job runner for the LLM pipeline
+- Writes every extraction request to one JSONL file (one line per case_id)
+- Runs the file through the concurrent extractor in llm_pipeline.py
+- Appends each result to an output JSONL as it completes, so an interrupted
+  run resumes where it stopped instead of paying for finished cases again
+- Results are keyed on custom_id + a hash of the request body, so a case is
+  re-run when its report text, prompt or model settings change
+
+Perplexity has no provider-side Batch endpoint (files/batches), so the job is
+executed locally; the input lines keep the usual custom_id/method/url/body
+batch layout so the same file can be submitted elsewhere unchanged.
+"""
+
+import json
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import List, Dict
+from config import Config
+from llm_pipeline import extract_one
+
+BATCH_INPUT_PATH  = Config.PROCESSED_DIR / "batch_input.jsonl"
+BATCH_OUTPUT_PATH = Config.PROCESSED_DIR / "batch_output.jsonl"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 1: Batch Input
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def write_batch_input(reports: List[Dict], path: Path = BATCH_INPUT_PATH) -> Path:
+    """Write one request line per report, keyed by case_id ("WA_0", ...)."""
+    Config.ensure_dirs()
+    with open(path, "w", encoding="utf-8") as f:
+        for report in reports:
+            line = {
+                "custom_id": f"{report['source']}_{report['id']}",
+                "method":    "POST",
+                "url":       "/v1/responses",
+                "body": {
+                    "model":             Config.LLM_MODEL,
+                    "input":             Config.build_extraction_prompt(report["text"]),
+                    "temperature":       Config.TEMPERATURE,
+                    "max_output_tokens": Config.MAX_OUTPUT_TOKENS
+                }
+            }
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    print(f"Batch input: {len(reports)} requests → {path}")
+    return path
+
+
+def _body_hash(body: Dict) -> str:
+    """Short stable hash of a request body (prompt, model, sampling settings)."""
+    data = json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _read_jsonl(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 2: Run & Fetch
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def _run_pending(requests: List[Dict], out_path: Path, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+    async with Config.get_async_llm_client(concurrency) as client:
+        with open(out_path, "a", encoding="utf-8") as out:
+            async def run(req: Dict):
+                output = await extract_one(client, sem, req["body"]["input"])
+                if "error" in output:
+                    return  # not recorded, so the next submit_batch retries it
+                record = {"custom_id": req["custom_id"], "prompt_hash": _body_hash(req["body"]), **output}
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            await asyncio.gather(*(run(req) for req in requests))
+
+
+def submit_batch(reports: List[Dict], concurrency: int = Config.LLM_CONCURRENCY,
+                 out_path: Path = BATCH_OUTPUT_PATH) -> Path:
+    """
+    Write the batch input for `reports` and run every request that has no
+    result in `out_path` for the same custom_id and request body.
+
+    Returns:
+        Path of the output JSONL (read it back with fetch_results).
+    """
+    in_path = write_batch_input(reports)
+    done = {(r["custom_id"], r.get("prompt_hash")) for r in _read_jsonl(out_path)}
+    requests = _read_jsonl(in_path)
+    pending = [req for req in requests if (req["custom_id"], _body_hash(req["body"])) not in done]
+    print(f"Batch: {len(requests) - len(pending)} already done, {len(pending)} pending")
+
+    if pending:
+        asyncio.run(_run_pending(pending, out_path, concurrency))
+    return out_path
+
+
+def fetch_results(out_path: Path = BATCH_OUTPUT_PATH,
+                  in_path: Path = BATCH_INPUT_PATH) -> Dict[str, Dict]:
+    """
+    Return {case_id: {"triples", "processing_time_s"}} for the requests in
+    `in_path`. Only records made from the same request body count (the key
+    submit_batch resumes on), so a changed case whose re-run failed is left
+    out instead of returning triples from its old text or prompt.
+    """
+    current = {(req["custom_id"], _body_hash(req["body"])) for req in _read_jsonl(in_path)}
+    results = {
+        r["custom_id"]: {"triples": r["triples"], "processing_time_s": r["processing_time_s"]}
+        for r in _read_jsonl(out_path)
+        if (r["custom_id"], r.get("prompt_hash")) in current
+    }
+    missing = len(current) - len(results)
+    if missing:
+        print(f"Batch: {missing} requests have no result for their current body")
+    return results
+
+
+# ─── Quick Test ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    from data_loader import load_data
+
+    reports = load_data(sample_size=Config.SAMPLE_SIZE, save_processed=False)
+    results = fetch_results(submit_batch(reports))
+    print(f"{len(results)} cases in batch output")
@@ -0,0 +1,187 @@
+""" Pipeline 2: LLM Extraction (Perplexity API + few-shot prompt)
+- Prompt is built by Config.build_extraction_prompt (ontology + few-shot examples)
+- Requests are sent concurrently with AsyncPerplexity, bounded by a Semaphore
+- Optional semantic cache (Config.USE_SEMANTIC_CACHE) skips near-duplicate reports
+- Outputs triples in {"head", "relation", "tail"} format matching nlp_baseline.py
+"""
+
+import json
+import time
+import asyncio
+from typing import List, Dict
+from config import Config
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 1: Response Parsing
+# The model is asked for a JSON list, but may wrap it in text or ``` fences
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def parse_triples(output_text: str) -> List[Dict]:
+    """
+    Pull the first JSON list out of the model output and keep only
+    well-formed {"head", "relation", "tail"} dicts.
+    """
+    start, end = output_text.find("["), output_text.rfind("]")
+    if start == -1 or end <= start:
+        return []
+    try:
+        data = json.loads(output_text[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+
+    triples = []
+    for item in data:
+        if isinstance(item, dict) and all(item.get(k) for k in ("head", "relation", "tail")):
+            triples.append({
+                "head":     str(item["head"]).strip(),
+                "relation": str(item["relation"]).strip().upper(),
+                "tail":     str(item["tail"]).strip()
+            })
+    return triples
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 2: Concurrent Extraction
+# One request per report; at most `concurrency` requests are in flight at once
+# ═══════════════════════════════════════════════════════════════════════════════
+
+async def extract_one(client, sem: asyncio.Semaphore, prompt: str) -> Dict:
+    """
+    Send one extraction prompt and return {"triples", "processing_time_s"}.
+    A failed request returns empty triples plus an "error" message.
+    """
+    error = None
+    async with sem:
+        start = time.time()
+        try:
+            response = await client.responses.create(
+                model=Config.LLM_MODEL,
+                input=prompt,
+                max_output_tokens=Config.MAX_OUTPUT_TOKENS,
+                temperature=Config.TEMPERATURE
+            )
+            triples = parse_triples(response.output_text or "")
+        except Exception as e:
+            print(f"LLM request failed: {e}")
+            triples, error = [], str(e)
+        elapsed = round(time.time() - start, 4)
+
+    output = {"triples": triples, "processing_time_s": elapsed}
+    if error:
+        output["error"] = error
+    return output
+
+
+async def extract_batch(texts: List[str], concurrency: int = Config.LLM_CONCURRENCY) -> List[Dict]:
+    """
+    Extract triples from many texts concurrently.
+
+    Returns:
+        List of {"triples", "processing_time_s"}, in the same order as `texts`.
+    """
+    prompts = [Config.build_extraction_prompt(t) for t in texts]
+    sem = asyncio.Semaphore(concurrency)
+    async with Config.get_async_llm_client(concurrency) as client:
+        return await asyncio.gather(*(extract_one(client, sem, p) for p in prompts))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION 3: Main Pipeline Runner
+# Same input/output shape as nlp_baseline.run_nlp_pipeline
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_llm_pipeline(reports: List[Dict], save_results: bool = True) -> List[Dict]:
+    """
+    Run LLM extraction on all cleaned reports from data_loader.py.
+
+    Args:
+        reports     : Output of load_data() — list of {"source", "id", "text"}
+        save_results: Save output to data/llm_triples.json
+
+    Returns:
+        List of dicts: [{"case_id", "source", "triples", "processing_time_s"}, ...]
+    """
+    # Exact duplicate reports are extracted once and mapped back afterwards
+    texts = list(dict.fromkeys(r["text"] for r in reports))
+    print(f"Unique texts : {len(texts)}/{len(reports)} reports")
+    start = time.time()
+
+    if Config.USE_SEMANTIC_CACHE:
+        from semantic_cache import SemanticCache
+        cache = SemanticCache()
+        cached, leader = cache.lookup_and_group(texts)
+        misses = [i for i, c in enumerate(cached) if c is None]
+        todo   = [i for i in misses if leader[i] == i]
+        print(f"Semantic cache: {len(texts) - len(misses)}/{len(texts)} hits, "
+              f"{len(misses) - len(todo)} near-duplicates within the batch")
+
+        outputs = [{"triples": c, "processing_time_s": 0.0} for c in cached]
+        for i, output in zip(todo, asyncio.run(extract_batch([texts[i] for i in todo]))):
+            outputs[i] = output
+
+        # Near-duplicates reuse their leader's triples, unless that call failed or came back empty
+        redo = []
+        for i in misses:
+            if leader[i] == i:
+                continue
+            src = outputs[leader[i]]
+            if "error" in src or not src["triples"]:
+                redo.append(i)
+            else:
+                outputs[i] = {"triples": src["triples"], "processing_time_s": 0.0}
+        if redo:
+            for i, output in zip(redo, asyncio.run(extract_batch([texts[i] for i in redo]))):
+                outputs[i] = output
+
+        fresh = [i for i in todo + redo if "error" not in outputs[i]]
+        cache.add_many([texts[i] for i in fresh], [outputs[i]["triples"] for i in fresh])
+        cache.save()
+    else:
+        outputs = asyncio.run(extract_batch(texts))
+
+    wall_time = round(time.time() - start, 2)
+    by_text = dict(zip(texts, outputs))
+
+    results = []
+    for report in reports:
+        output = by_text[report["text"]]
+        results.append({
+            "case_id":            f"{report['source']}_{report['id']}",
+            "source":             report["source"],
+            "triples":            output["triples"],
+            "triple_count":       len(output["triples"]),
+            "processing_time_s":  output["processing_time_s"]
+        })
+
+    avg_triples = sum(r["triple_count"] for r in results) / len(results) if results else 0
+    print(f"LLM Pipeline complete: {len(results)} reports")
+    print(f"Wall time    : {wall_time}s")
+    print(f"Avg triples  : {round(avg_triples, 2)} per report")
+
+    if save_results and results:
+        out_path = Config.DATA_DIR / "llm_triples.json"
+        Config.save_json(out_path, results)
+        print(f"Saved → {out_path}")
+
+    return results
+
+
+# ─── Quick Test ───────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    sample = [{
+        "source": "WA",
+        "id": 0,
+        "text": (
+            "This incident occurred on March 2, 2022, at 5:00 AM, in Richland, Benton, "
+            "on route 182 increasing milepost direction at milepost 0.25. "
+            "The conditions during the time of the accident were at dawn with a wet road surface. "
+            "Vehicle1 was moving east, in the direction of increasing milepost. "
+            "The driver was going straight ahead, was not ejected, and was exceeding a reasonable safe speed. "
+            "Person 1: Motor Vehicle Driver, Female, 24, Lap & Shoulder Used."
+        )
+    }]
+
+    results = run_llm_pipeline(sample, save_results=False)
+    for triple in results[0]["triples"]:
+        print(triple)
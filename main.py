@@ -3,7 +3,6 @@ Phase 1 — Test NLP baseline and upload triples to Neo4j.
 Phase 2 — LLM pipeline will be plugged in later (marked with TODO).
 """
 
-import json
 import logging
 from config import Config
 from data_loader import load_data
@@ -123,8 +122,7 @@ def save_summary(nlp_results: list):
         # TODO Phase 2: add llm_results summary here
     }
     out_path = Config.DATA_DIR / "run_summary.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2)
+    Config.save_json(out_path, summary)
     logger.info(f"Run summary saved → {out_path}")
     logger.info(f"Summary: {summary}")
 
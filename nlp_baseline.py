@@ -1,22 +1,32 @@
 """ Pipeline 1: Traditional NLP Baseline (spaCy + Regex)
-- spaCy en_core_web_lg handles NER (dates, locations, persons, cardinals)
+- spaCy (Config.SPACY_MODEL, en_core_web_lg by default) handles NER (dates, locations, persons, cardinals)
 - Regex handles semi-structured fields (Person block, vehicle, road conditions)
 - Outputs triples in {"head", "relation", "tail"} format matching llm_pipeline.py
 """
 
 import re
-import json
 import time
 import spacy
+from spacy.tokens import Doc
 from typing import List, Dict
 from config import Config
 
 # ─── Load spaCy Model ─────────────────────────────────────────────────────────
-# Run once: python -m spacy download en_core_web_lg
+# Run once: python -m spacy download <Config.SPACY_MODEL>
+# Only NER is used. In the en_core_web_* pipelines ner has its own internal
+# tok2vec, so the shared tok2vec, tagger, parser etc. are not loaded at all.
+# Model choice (Config.SPACY_MODEL):
+#   en_core_web_lg : default. Its ner tok2vec uses the 300-d static vectors as
+#                    input features, so the vectors must stay loaded.
+#   en_core_web_sm : ~12MB, no static vectors, noticeably faster NER; compare
+#                    triples on a sample before switching the baseline.
 try:
-    nlp = spacy.load("en_core_web_lg")
+    nlp = spacy.load(
+        Config.SPACY_MODEL,
+        exclude=["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+    )
 except OSError:
-    raise OSError(" spaCy model not found. Run: python -m spacy download en_core_web_lg")
+    raise OSError(f" spaCy model not found. Run: python -m spacy download {Config.SPACY_MODEL}")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -24,9 +34,9 @@ except OSError:
 # Extracts standard entities: DATE, TIME, GPE, CARDINAL, PERSON
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def extract_spacy_entities(text: str) -> Dict[str, List[str]]:
+def extract_spacy_entities(doc: Doc) -> Dict[str, List[str]]:
     """
-    Run spaCy NER and return entities grouped by label.
+    Group the NER entities of an already processed Doc by label.
 
     Returns dict like:
     {
@@ -37,7 +47,6 @@ def extract_spacy_entities(text: str) -> Dict[str, List[str]]:
         "PERSON":   ["Person 1"]
     }
     """
-    doc = nlp(text)
     entities: Dict[str, List[str]] = {}
     for ent in doc.ents:
         entities.setdefault(ent.label_, []).append(ent.text.strip())
@@ -46,83 +55,129 @@ def extract_spacy_entities(text: str) -> Dict[str, List[str]]:
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 2: Regex Pattern Extractors
-# Each function targets one specific semi-structured field in the report
+# Each function targets one specific semi-structured field in the report.
+# All patterns are compiled once at import time.
 # ═══════════════════════════════════════════════════════════════════════════════
 
+_RE_DATETIME = re.compile(
+    r"occurred on\s+([A-Za-z]+ \d{1,2},\s*\d{4}),?\s+at\s+(\d{1,2}:\d{2}\s*[APap][Mm])"
+)
+_RE_LOCATION      = re.compile(r"\bin\s+([A-Z][a-zA-Z\s]+,\s*[A-Z][a-zA-Z\s]+?)(?:,\s*on route|\.|$)")
+_RE_ROUTE         = re.compile(r"on route\s+(\w+)", re.IGNORECASE)
+_RE_ROAD_TYPE     = re.compile(r"road classification is\s+([^.]+)\.", re.IGNORECASE)
+_RE_VEHICLE_COUNT = re.compile(r"(\d+)\s+vehicle[s]?\s+involved", re.IGNORECASE)
+
+# Environment, cause and severity patterns are lowercase and run
+# case-sensitively on text.lower(), which build_triples computes once per
+# report; that is much cheaper than IGNORECASE folding inside every search.
+# They only return lowercased or fixed labels, so no casing is lost.
+_RE_LIGHTING = re.compile(r"(?:were\s+)?at\s+(dawn|dusk|dark|daylight|night)")
+_RE_SURFACE  = re.compile(r"(wet|dry|icy|snowy|muddy)\s+road surface")
+_RE_WEATHER  = re.compile(r"(rain|snow|fog|wind|clear|cloudy)\w*")
+
+# Cause keywords: canonical cause -> lowercase literal phrases. They are
+# matched with plain substring search on the lowercased text once, which is
+# far cheaper than case-insensitive regex alternation. Only the two phrases
+# that need real regex syntax live in _CAUSE_REGEX.
+CAUSE_KEYWORDS: Dict[str, tuple] = {
+    "speeding":               ("exceeding a reasonable safe speed", "speeding"),
+    "drunk driving":          ("influence of alcohol", "drunk driving", "dui"),
+    "drug influence":         ("influence of drugs", "under the influence of drug"),
+    "distracted driving":     ("distracted", "using phone", "inattention"),
+    "failure to yield":       ("failure to yield", "did not yield"),
+    "ran red light":          ("ran the red light",),
+    "improper lane change":   ("improper lane change", "unsafe lane"),
+    "road defect":            ("road defect", "pavement failure", "pothole"),
+}
+_CAUSE_REGEX = {
+    "speeding":      re.compile(r"over.?speed"),
+    "ran red light": re.compile(r"ran a? red light"),
+}
+
+_RE_OBJECTS = re.compile(r"specifically\s+(?:a\s+)?([A-Za-z\s]+?)(?:\.|,|$)", re.IGNORECASE)
+# Person and vehicle fields become node names, so they are matched on the
+# original text (IGNORECASE) and keep their casing exactly
+_RE_PERSON  = re.compile(
+    r"Person\s+(\d+):\s+([^,]+),\s+(Male|Female),\s+(\d+)(?:,\s+([^.\n]+))?", re.IGNORECASE
+)
+_RE_VEHICLE      = re.compile(r"Vehicle\s*(\d+)\s+was\s+moving\s+([a-zA-Z]+)", re.IGNORECASE)
+_RE_VEHICLE_TYPE = re.compile(r"(non-commercial|commercial|truck|motorcycle|bus)\s+vehicle", re.IGNORECASE)
+
+_RE_SEVERITY_FATAL  = re.compile(r"\d+\s+facilit|fatal|death|killed")
+_RE_SEVERITY_INJURY = re.compile(r"\d+\s+injur|serious injur")
+_RE_SEVERITY_PDO    = re.compile(r"property damage|no injur")
+# Casualty strings are returned as written, so these run on the original text
+_RE_CASUALTIES = [
+    re.compile(p, re.IGNORECASE)
+    for p in (r"(\d+)\s+injur\w+", r"(\d+)\s+facilit\w+", r"(\d+)\s+death\w*")
+]
+
+
 def extract_datetime(text: str) -> str | None:
     """Extract date and time: 'occurred on March 2, 2022, at 5:00 AM'"""
-    match = re.search(
-        r"occurred on\s+([A-Za-z]+ \d{1,2},\s*\d{4}),?\s+at\s+(\d{1,2}:\d{2}\s*[APap][Mm])",
-        text
-    )
+    match = _RE_DATETIME.search(text)
     return f"{match.group(1)} {match.group(2)}" if match else None
 
 
 def extract_location(text: str) -> str | None:
     """Extract city/county: 'in Richland, Benton'"""
-    match = re.search(r"\bin\s+([A-Z][a-zA-Z\s]+,\s*[A-Z][a-zA-Z\s]+?)(?:,\s*on route|\.|$)", text)
+    match = _RE_LOCATION.search(text)
     return match.group(1).strip() if match else None
 
 
 def extract_route(text: str) -> str | None:
     """Extract road/route: 'on route 182'"""
-    match = re.search(r"on route\s+(\w+)", text, re.IGNORECASE)
+    match = _RE_ROUTE.search(text)
     return f"Route {match.group(1)}" if match else None
 
 
 def extract_road_type(text: str) -> str | None:
     """Extract road classification: 'urban freeways with fewer than 4 lanes'"""
-    match = re.search(r"road classification is\s+([^.]+)\.", text, re.IGNORECASE)
+    match = _RE_ROAD_TYPE.search(text)
     return match.group(1).strip() if match else None
 
 
 def extract_vehicle_count(text: str) -> str | None:
     """Extract number of vehicles: '1 vehicle involved'"""
-    match = re.search(r"(\d+)\s+vehicle[s]?\s+involved", text, re.IGNORECASE)
+    match = _RE_VEHICLE_COUNT.search(text)
     return f"{match.group(1)} vehicle(s)" if match else None
 
 
-def extract_environment(text: str) -> List[str]:
+def extract_environment(text: str, text_lc: str | None = None) -> List[str]:
     """
     Extract weather/lighting conditions.
     Looks for: 'at dawn', 'wet road surface', 'rainy', 'foggy', etc.
+    Pass `text_lc` (text.lower()) to skip lowercasing here.
     """
+    text_lc = text.lower() if text_lc is None else text_lc
     conditions = []
-    lighting_match = re.search(r"(?:were\s+)?at\s+(dawn|dusk|dark|daylight|night)", text, re.IGNORECASE)
-    surface_match  = re.search(r"(wet|dry|icy|snowy|muddy)\s+road surface", text, re.IGNORECASE)
-    weather_match  = re.search(r"(rain|snow|fog|wind|clear|cloudy)\w*", text, re.IGNORECASE)
+    lighting_match = _RE_LIGHTING.search(text_lc)
+    surface_match  = _RE_SURFACE.search(text_lc)
+    weather_match  = _RE_WEATHER.search(text_lc)
 
-    if lighting_match: conditions.append(lighting_match.group(1).lower())
-    if surface_match:  conditions.append(f"{surface_match.group(1).lower()} road surface")
-    if weather_match:  conditions.append(weather_match.group(1).lower())
+    if lighting_match: conditions.append(lighting_match.group(1))
+    if surface_match:  conditions.append(f"{surface_match.group(1)} road surface")
+    if weather_match:  conditions.append(weather_match.group(1))
     return conditions
 
 
-def extract_cause(text: str) -> List[str]:
+def extract_cause(text: str, text_lc: str | None = None) -> List[str]:
     """
     Extract causes via keyword matching against known cause patterns.
     Maps to CAUSE relationship in ontology.
     """
-    cause_patterns = {
-        "speeding":               r"exceeding a reasonable safe speed|over.?speed|speeding",
-        "drunk driving":          r"influence of alcohol|drunk driving|DUI",
-        "drug influence":         r"influence of drugs|under the influence of drug",
-        "distracted driving":     r"distracted|using phone|inattention",
-        "failure to yield":       r"failure to yield|did not yield",
-        "ran red light":          r"ran a? red light|ran the red light",
-        "improper lane change":   r"improper lane change|unsafe lane",
-        "road defect":            r"road defect|pavement failure|pothole",
-    }
+    text_lc = text.lower() if text_lc is None else text_lc
     found = []
-    for cause, pattern in cause_patterns.items():
-        if re.search(pattern, text, re.IGNORECASE):
+    for cause, keywords in CAUSE_KEYWORDS.items():
+        pattern = _CAUSE_REGEX.get(cause)
+        if any(k in text_lc for k in keywords) or (pattern and pattern.search(text_lc)):
             found.append(cause)
     return found
 
 
 def extract_objects(text: str) -> List[str]:
     """Extract fixed objects involved: 'a Roadway Ditch', 'a Guard Rail'"""
-    match = re.search(r"specifically\s+(?:a\s+)?([A-Za-z\s]+?)(?:\.|,|$)", text, re.IGNORECASE)
+    match = _RE_OBJECTS.search(text)
     return [match.group(1).strip()] if match else []
 
 
@@ -133,11 +188,7 @@ def extract_persons(text: str) -> List[Dict]:
     Returns list of dicts with role, gender, age, restraint.
     """
     persons = []
-    pattern = re.finditer(
-        r"Person\s+(\d+):\s+([^,]+),\s+(Male|Female),\s+(\d+)(?:,\s+([^.\n]+))?",
-        text, re.IGNORECASE
-    )
-    for match in pattern:
+    for match in _RE_PERSON.finditer(text):
         persons.append({
             "id":        f"Person{match.group(1)}",
             "role":      match.group(2).strip(),
@@ -154,31 +205,28 @@ def extract_vehicles(text: str) -> List[Dict]:
     Pattern: 'Vehicle1 was moving east... The first vehicle was moving straight'
     """
     vehicles = []
-    pattern = re.finditer(
-        r"Vehicle\s*(\d+)\s+was\s+moving\s+([a-zA-Z]+)",
-        text, re.IGNORECASE
-    )
-    for match in pattern:
+    for match in _RE_VEHICLE.finditer(text):
         vehicles.append({
             "id":        f"Vehicle{match.group(1)}",
             "direction": match.group(2).strip()
         })
 
     # Extract vehicle type: 'non-commercial vehicle', 'truck', etc.
-    type_match = re.search(r"(non-commercial|commercial|truck|motorcycle|bus)\s+vehicle", text, re.IGNORECASE)
+    type_match = _RE_VEHICLE_TYPE.search(text)
     if type_match and vehicles:
         vehicles[0]["type"] = type_match.group(0).strip()
 
     return vehicles
 
 
-def extract_severity(text: str) -> str | None:
+def extract_severity(text: str, text_lc: str | None = None) -> str | None:
     """Infer severity from casualty keywords."""
-    if re.search(r"\d+\s+facilit|fatal|death|killed", text, re.IGNORECASE):
+    text_lc = text.lower() if text_lc is None else text_lc
+    if _RE_SEVERITY_FATAL.search(text_lc):
         return "Fatal"
-    if re.search(r"\d+\s+injur|serious injur", text, re.IGNORECASE):
+    if _RE_SEVERITY_INJURY.search(text_lc):
         return "Injury"
-    if re.search(r"property damage|no injur", text, re.IGNORECASE):
+    if _RE_SEVERITY_PDO.search(text_lc):
         return "Property Damage"
     return None
 
@@ -186,8 +234,8 @@ def extract_severity(text: str) -> str | None:
 def extract_casualties(text: str) -> List[str]:
     """Extract casualty counts: '2 injured', '1 fatality'"""
     casualties = []
-    for pattern in [r"(\d+)\s+injur\w+", r"(\d+)\s+facilit\w+", r"(\d+)\s+death\w*"]:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _RE_CASUALTIES:
+        match = pattern.search(text)
         if match:
             casualties.append(match.group(0).strip())
     return casualties
@@ -198,13 +246,15 @@ def extract_casualties(text: str) -> List[str]:
 # Assembles all extracted info into ontology-aligned triples
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def build_triples(text: str, case_id: str) -> List[Dict]:
+def build_triples(text: str, case_id: str, doc: Doc | None = None) -> List[Dict]:
     """
     Combine spaCy NER + regex extractions into a list of triples.
     All triples use case_id as the head anchor (AccidentCase node).
+    Pass `doc` when the text was already run through nlp.pipe.
     """
     triples = []
-    spacy_ents = extract_spacy_entities(text)
+    spacy_ents = extract_spacy_entities(doc if doc is not None else nlp(text))
+    text_lc = text.lower()  # shared by the case-insensitive extractors
 
     # Helper: safely add triple if tail is not None/empty
     def add(relation: str, tail):
@@ -234,19 +284,20 @@ def build_triples(text: str, case_id: str) -> List[Dict]:
     add("BELONG_TO", extract_road_type(text))
 
     # ── Environment ───────────────────────────────────────────────────────────
-    for condition in extract_environment(text):
+    for condition in extract_environment(text, text_lc):
         add("AFFECTED_BY", condition)
 
     # ── Cause ─────────────────────────────────────────────────────────────────
-    for cause in extract_cause(text):
+    for cause in extract_cause(text, text_lc):
         triples.append({"head": cause, "relation": "CAUSE", "tail": case_id})
 
     # ── Vehicles ──────────────────────────────────────────────────────────────
-    for vehicle in extract_vehicles(text):
+    vehicles = extract_vehicles(text)
+    for vehicle in vehicles:
         add("INVOLVE", vehicle["id"])
 
     # Fallback vehicle count from regex
-    if not extract_vehicles(text):
+    if not vehicles:
         add("INVOLVE", extract_vehicle_count(text))
 
     # ── Objects ───────────────────────────────────────────────────────────────
@@ -261,7 +312,7 @@ def build_triples(text: str, case_id: str) -> List[Dict]:
         triples.append({"head": person["id"], "relation": "INVOLVE", "tail": f"{person['gender']}, Age {person['age']}"})
 
     # ── Severity ──────────────────────────────────────────────────────────────
-    add("MEASURE", extract_severity(text))
+    add("MEASURE", extract_severity(text, text_lc))
 
     # ── Casualties ────────────────────────────────────────────────────────────
     for casualty in extract_casualties(text):
@@ -288,13 +339,19 @@ def run_nlp_pipeline(reports: List[Dict], save_results: bool = True) -> List[Dic
     """
     results = []
 
-    for report in reports:
+    # NER runs in batches through nlp.pipe; its time is spread evenly over the
+    # reports afterwards, the regex/triple time is measured per report.
+    texts = (r["text"] for r in reports)
+    docs  = nlp.pipe(texts, batch_size=Config.SPACY_BATCH_SIZE, n_process=Config.SPACY_N_PROCESS)
+    pipeline_start = time.time()
+
+    for report, doc in zip(reports, docs):
         case_id   = f"{report['source']}_{report['id']}"
         text      = report["text"]
 
         start     = time.time()
-        triples   = build_triples(text, case_id)
-        elapsed   = round(time.time() - start, 4)
+        triples   = build_triples(text, case_id, doc)
+        elapsed   = time.time() - start
 
         results.append({
             "case_id":            case_id,
@@ -304,6 +361,12 @@ def run_nlp_pipeline(reports: List[Dict], save_results: bool = True) -> List[Dic
             "processing_time_s":  elapsed
         })
 
+    if results:
+        build_time = sum(r["processing_time_s"] for r in results)
+        ner_share  = (time.time() - pipeline_start - build_time) / len(results)
+        for r in results:
+            r["processing_time_s"] = round(r["processing_time_s"] + ner_share, 4)
+
     total_time = sum(r["processing_time_s"] for r in results)
     avg_triples = sum(r["triple_count"] for r in results) / len(results) if results else 0
     print(f"NLP Pipeline complete: {len(results)} reports")
@@ -312,8 +375,7 @@ def run_nlp_pipeline(reports: List[Dict], save_results: bool = True) -> List[Dic
 
     if save_results and results:
         out_path = Config.DATA_DIR / "nlp_triples.json"
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        Config.save_json(out_path, results)
         print(f"Saved → {out_path}")
 
     return results
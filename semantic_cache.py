@@ -0,0 +1,145 @@
+""" Semantic response cache for the LLM pipeline
+- Embeds each report with a small local sentence-transformers model
+- Looks up the nearest cached report in a FAISS inner-product index
+- If cosine similarity > Config.SEMANTIC_CACHE_THRESHOLD and both reports
+  have the same words in the same order, the cached triples are returned
+  and the LLM call is skipped
+- Near-duplicates inside one batch are grouped, so only the first of each
+  group is sent to the LLM
+- Empty results are never cached, so one failed call is not reused for
+  every similar report
+
+The reports follow one template, so two different crashes (another city,
+road, vehicle type or weather) embed very close together, and no cosine
+threshold on its own keeps a hit from carrying another case's entities into
+the KG. A hit therefore also needs an identical word sequence: reports may
+only differ in whitespace and punctuation (re-exported or reformatted
+copies of the same case). The embedding search just finds the candidates;
+the threshold has not been validated on this data.
+
+Optional: needs `faiss-cpu` and `sentence-transformers`. Turn it on with
+Config.USE_SEMANTIC_CACHE; llm_pipeline.py only imports this module then.
+"""
+
+import re
+import json
+import faiss
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Callable, Optional, Tuple
+from sentence_transformers import SentenceTransformer
+from config import Config
+
+INDEX_PATH = Config.PROCESSED_DIR / "cache.faiss"
+STORE_PATH = Config.PROCESSED_DIR / "cache.jsonl"
+
+_WORD_RE = re.compile(r"\w+")
+_TOP_K   = 5  # neighbours checked per lookup, the nearest may fail the word check
+
+
+class SemanticCache:
+    """FAISS index of report embeddings + a parallel list of cached triples."""
+
+    def __init__(self, threshold: float = Config.SEMANTIC_CACHE_THRESHOLD,
+                 index_path: Path = INDEX_PATH, store_path: Path = STORE_PATH):
+        self.threshold  = threshold
+        self.index_path = index_path
+        self.store_path = store_path
+        self.model      = SentenceTransformer(Config.SEMANTIC_CACHE_MODEL)
+
+        if index_path.exists() and store_path.exists():
+            self.index = faiss.read_index(str(index_path))
+            with open(store_path, encoding="utf-8") as f:
+                self.entries: List[Dict] = [json.loads(line) for line in f if line.strip()]
+        else:
+            self.index   = faiss.IndexFlatIP(self.model.get_sentence_embedding_dimension())
+            self.entries = []
+        print(f"Semantic cache: {len(self.entries)} entries loaded")
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Unit-length embeddings, so inner product == cosine similarity."""
+        return np.asarray(
+            self.model.encode(texts, normalize_embeddings=True), dtype="float32"
+        )
+
+    def _is_match(self, score: float, text: str, other: str) -> bool:
+        """Close enough in embedding space, and the same words in the same order."""
+        return score > self.threshold and _WORD_RE.findall(text) == _WORD_RE.findall(other)
+
+    def _first_match(self, text: str, scores, ids, others: List[str]) -> Optional[int]:
+        for s, i in zip(scores, ids):
+            if i >= 0 and self._is_match(s, text, others[i]):
+                return int(i)
+        return None
+
+    def _lookup(self, texts: List[str], emb: np.ndarray) -> List[Optional[List[Dict]]]:
+        if not self.entries:
+            return [None] * len(texts)
+        others = [e["text"] for e in self.entries]
+        scores, ids = self.index.search(emb, min(_TOP_K, len(others)))
+        hits = [self._first_match(t, s, i, others) for t, s, i in zip(texts, scores, ids)]
+        return [None if j is None else self.entries[j]["triples"] for j in hits]
+
+    def lookup_many(self, texts: List[str]) -> List[Optional[List[Dict]]]:
+        """Cached triples for each text, or None where there is no close match."""
+        if not texts or not self.entries:
+            return [None] * len(texts)
+        return self._lookup(texts, self._embed(texts))
+
+    def lookup_and_group(self, texts: List[str]) -> Tuple[List[Optional[List[Dict]]], List[int]]:
+        """
+        lookup_many plus near-duplicate grouping among the misses in `texts`.
+        leader[i] is the earlier miss that text i is a near-duplicate of
+        (i itself otherwise), so only misses with leader[i] == i need an LLM call.
+        """
+        if not texts:
+            return [], []
+        emb    = self._embed(texts)
+        cached = self._lookup(texts, emb)
+        leader = list(range(len(texts)))
+
+        group, group_ids = faiss.IndexFlatIP(emb.shape[1]), []
+        for i, c in enumerate(cached):
+            if c is not None:
+                continue
+            if group_ids:
+                scores, ids = group.search(emb[i:i + 1], min(_TOP_K, len(group_ids)))
+                j = self._first_match(texts[i], scores[0], ids[0], [texts[g] for g in group_ids])
+                if j is not None:
+                    leader[i] = group_ids[j]
+                    continue
+            group.add(emb[i:i + 1])
+            group_ids.append(i)
+        return cached, leader
+
+    def lookup(self, text: str) -> Optional[List[Dict]]:
+        return self.lookup_many([text])[0]
+
+    def add_many(self, texts: List[str], triples_list: List[List[Dict]]):
+        """Cache the non-empty results; an empty list is usually a failed call."""
+        kept = [(t, tr) for t, tr in zip(texts, triples_list) if tr]
+        if not kept:
+            return
+        self.index.add(self._embed([t for t, _ in kept]))
+        self.entries.extend({"text": t, "triples": tr} for t, tr in kept)
+
+    def add(self, text: str, triples: List[Dict]):
+        self.add_many([text], [triples])
+
+    def get_or_compute(self, text: str, compute_fn: Callable[[str], List[Dict]]) -> List[Dict]:
+        """Return cached triples for a near-duplicate of `text`, else compute and cache them."""
+        cached = self.lookup(text)
+        if cached is not None:
+            return cached
+        triples = compute_fn(text)
+        self.add(text, triples)
+        return triples
+
+    def save(self):
+        """Persist the index and the entries next to the processed data."""
+        Config.ensure_dirs()
+        faiss.write_index(self.index, str(self.index_path))
+        with open(self.store_path, "w", encoding="utf-8") as f:
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        print(f"Semantic cache saved → {self.index_path} ({len(self.entries)} entries)")
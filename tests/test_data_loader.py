@@ -0,0 +1,63 @@
+import re
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+import data_loader as dl
+
+# Whitespace that Python's \s matches but RE2's \s ([\t\n\f\r ]) does not
+UNICODE_WS = ["\xa0", "\u2003", "\u3000", "\x0b", "\x1c", "\x85", "\u2028"]
+
+RAW_REPORTS = [
+    "<s>Human:\xa0Accident\u2003on March 2.</s><s>Assistant: <ZERO>\n<\\\\s>",
+    "\u3000 Vehicle1 was moving\x0b\x0beast,\u2028Person 1: Driver \xa0",
+    "<s>\u3000Human:\u2003Hit a <b>pole</b>\x1c\x85 at dawn",
+    "plain ascii   report\twith\ttabs",
+    "\xa0\u3000",
+    "",
+    # Bare "<" that is not part of a tag: the </s> cut has to run before tag stripping
+    "speed<50 km/h</s><s>Assistant: <ONE>",
+    "a < b </s> rest",
+    "speed<50 <s>Human: x > y",
+]
+
+
+def _baseline_clean(raw_text: str) -> str:
+    """clean_report as it was before the compiled/vectorized rewrite."""
+    text = re.sub(r"<s>\s*Human:\s*", "", raw_text)
+    text = re.sub(r"</s>.*", "", text, flags=re.DOTALL)
+    text = re.sub(r"<[^>]+>", "", text)
+    text = re.sub(r"<\\+s>", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def test_whitespace_class_matches_str_isspace():
+    ws = re.compile(dl._WS)
+    chars = [chr(i) for i in range(sys.maxunicode + 1)]
+    assert [c for c in chars if ws.fullmatch(c)] == [c for c in chars if c.isspace()]
+
+
+@pytest.mark.parametrize("raw", RAW_REPORTS)
+def test_clean_report_matches_baseline(raw):
+    assert dl.clean_report(raw) == _baseline_clean(raw)
+
+
+def test_clean_reports_matches_clean_report_on_unicode_whitespace():
+    texts = pd.Series(RAW_REPORTS + [f"a{ws}{ws}b{ws}" for ws in UNICODE_WS])
+    assert dl.clean_reports(texts).tolist() == [dl.clean_report(t) for t in texts]
+
+
+def test_clean_reports_matches_baseline():
+    assert dl.clean_reports(pd.Series(RAW_REPORTS)).tolist() == [_baseline_clean(t) for t in RAW_REPORTS]
+
+
+def test_load_cleaned_drops_unicode_blank_rows(tmp_path):
+    csv = tmp_path / "reports.csv"
+    pd.DataFrame({"text": ["First report.", "\u3000\xa0", "Second\u2003report. "]}).to_csv(csv, index=False)
+
+    cleaned = dl._load_cleaned(csv, use_cache=False)
+    assert cleaned.index.tolist() == [0, 2]
+    assert cleaned.tolist() == ["First report.", "Second report."]
@@ -0,0 +1,50 @@
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+try:
+    import nlp_baseline as nb
+except OSError:
+    # Only the regex extractors are tested here. When Config.SPACY_MODEL is
+    # not downloaded, load the module on a blank English pipeline instead.
+    _load = spacy.load
+    spacy.load = lambda name, **kwargs: spacy.blank("en")
+    try:
+        import nlp_baseline as nb
+    finally:
+        spacy.load = _load
+
+
+# "İ".lower() is two characters long, so offsets in text.lower() no longer
+# line up with the original text after it
+NON_ASCII_REPORT = (
+    "This incident occurred on March 2, 2022, at 5:00 AM, in İzmir Street, Richland. "
+    "The conditions during the time of the accident were AT DAWN with a WET road surface. "
+    "Vehicle1 was moving East, a Truck vehicle. There were 2 Injured and 1 Deaths. "
+    "Person 1: Motor Vehicle Driver, Female, 24, Lap & Shoulder Used."
+)
+
+
+def test_casualties_keep_original_casing_on_non_ascii_report():
+    assert nb.extract_casualties(NON_ASCII_REPORT) == ["2 Injured", "1 Deaths"]
+
+
+def test_persons_and_vehicles_keep_original_casing_on_non_ascii_report():
+    person, = nb.extract_persons(NON_ASCII_REPORT)
+    assert (person["role"], person["gender"], person["restraint"]) == \
+        ("Motor Vehicle Driver", "Female", "Lap & Shoulder Used")
+
+    vehicle, = nb.extract_vehicles(NON_ASCII_REPORT)
+    assert (vehicle["direction"], vehicle["type"]) == ("East", "Truck vehicle")
+
+
+def test_lowercased_extractors_ignore_case():
+    assert nb.extract_environment(NON_ASCII_REPORT) == ["dawn", "wet road surface"]
+    assert nb.extract_severity(NON_ASCII_REPORT) == "Fatal"
+    assert nb.extract_cause("Driver was SPEEDING, DUI") == ["speeding", "drunk driving"]
+
+
+def test_build_triples_tails_keep_original_casing():
+    triples = nb.build_triples(NON_ASCII_REPORT, "WA_0", nb.nlp(NON_ASCII_REPORT))
+    tails = {t["tail"] for t in triples}
+    assert {"Motor Vehicle Driver", "Female, Age 24", "2 Injured", "1 Deaths"} <= tails